@@ -0,0 +1,262 @@
+import hashlib
+import mimetypes
+import os
+from contextlib import closing
+from datetime import datetime
+from typing import List, Dict, Optional, Iterator, Tuple
+
+from PyQt6.QtCore import Qt, QByteArray, QBuffer, QIODevice
+from PyQt6.QtGui import QImage
+from database import Database
+
+CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = 64
+
+class AttachmentStore:
+    """Хранилище вложений заметок.
+
+    Содержимое файлов хранится один раз в таблице blobs (по SHA-256),
+    а заметки ссылаются на него через таблицу note_attachments.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or Database()
+        self.init_db()
+
+    def init_db(self):
+        """Инициализация таблиц вложений"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Содержимое файлов, по одной записи на уникальный хеш
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sha256 TEXT UNIQUE NOT NULL,
+                    size INTEGER NOT NULL,
+                    mime_type TEXT,
+                    data BLOB NOT NULL
+                )
+            ''')
+
+            # Связь заметок с содержимым
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS note_attachments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+                    blob_id INTEGER NOT NULL REFERENCES blobs(id),
+                    filename TEXT NOT NULL,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (note_id, blob_id)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_note_attachments_blob
+                ON note_attachments (blob_id)
+            ''')
+
+            # Кэш миниатюр
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS thumbnails (
+                    blob_id INTEGER NOT NULL REFERENCES blobs(id) ON DELETE CASCADE,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (blob_id, size)
+                )
+            ''')
+
+            conn.commit()
+
+    def _hash_file(self, path: str) -> Tuple[str, int]:
+        """Подсчет SHA-256 и размера файла без загрузки целиком"""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    def add_file(self, note_id: int, path: str, filename: str = "") -> int:
+        """Прикрепление файла к заметке.
+
+        Если такое содержимое уже есть в базе, файл повторно не записывается.
+        """
+        filename = filename or os.path.basename(path)
+        sha256, size = self._hash_file(path)
+        mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM blobs WHERE sha256 = ?", (sha256,))
+            row = cursor.fetchone()
+
+            if row:
+                blob_id = row[0]
+            else:
+                cursor.execute('''
+                    INSERT INTO blobs (sha256, size, mime_type, data)
+                    VALUES (?, ?, ?, zeroblob(?))
+                ''', (sha256, size, mime_type, size))
+                blob_id = cursor.lastrowid
+                self._write_blob(conn, blob_id, path, sha256)
+
+            cursor.execute('''
+                INSERT OR IGNORE INTO note_attachments (note_id, blob_id, filename, added_at)
+                VALUES (?, ?, ?, ?)
+            ''', (note_id, blob_id, filename, datetime.now()))
+            cursor.execute('''
+                SELECT id FROM note_attachments WHERE note_id = ? AND blob_id = ?
+            ''', (note_id, blob_id))
+            attachment_id = cursor.fetchone()[0]
+            conn.commit()
+            return attachment_id
+
+    def _write_blob(self, conn, blob_id: int, path: str, sha256: str):
+        """Потоковая запись файла в заранее выделенный BLOB"""
+        digest = hashlib.sha256()
+        with conn.blobopen("blobs", "data", blob_id) as blob, open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                blob.write(chunk)
+
+        # Файл мог измениться между подсчетом хеша и записью
+        if digest.hexdigest() != sha256:
+            conn.rollback()
+            raise ValueError(f"Файл изменился во время записи: {path}")
+
+    def get_attachments(self, note_id: int) -> List[Dict]:
+        """Получение списка вложений заметки (без содержимого)"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT a.id, a.note_id, a.blob_id, a.filename, a.added_at,
+                       b.sha256, b.size, b.mime_type
+                FROM note_attachments a
+                JOIN blobs b ON b.id = a.blob_id
+                WHERE a.note_id = ?
+                ORDER BY a.added_at
+            ''', (note_id,))
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_attachment(self, attachment_id: int) -> Optional[Dict]:
+        """Получение вложения по ID (без содержимого)"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT a.id, a.note_id, a.blob_id, a.filename, a.added_at,
+                       b.sha256, b.size, b.mime_type
+                FROM note_attachments a
+                JOIN blobs b ON b.id = a.blob_id
+                WHERE a.id = ?
+            ''', (attachment_id,))
+            row = cursor.fetchone()
+
+            if row:
+                columns = [column[0] for column in cursor.description]
+                return dict(zip(columns, row))
+            return None
+
+    def iter_content(self, blob_id: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Ленивое чтение содержимого по частям"""
+        with closing(self.db.get_connection()) as conn:
+            with conn.blobopen("blobs", "data", blob_id, readonly=True) as blob:
+                for chunk in iter(lambda: blob.read(chunk_size), b""):
+                    yield chunk
+
+    def export(self, attachment_id: int, path: str):
+        """Сохранение вложения в файл"""
+        attachment = self.get_attachment(attachment_id)
+        if not attachment:
+            raise KeyError(attachment_id)
+
+        with open(path, 'wb') as f:
+            for chunk in self.iter_content(attachment['blob_id']):
+                f.write(chunk)
+
+    def get_thumbnail(self, blob_id: int, size: int = THUMBNAIL_SIZE) -> Optional[bytes]:
+        """Получение миниатюры изображения в формате PNG (с кэшированием)"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT data FROM thumbnails WHERE blob_id = ? AND size = ?
+            ''', (blob_id, size))
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+
+            cursor.execute("SELECT mime_type FROM blobs WHERE id = ?", (blob_id,))
+            row = cursor.fetchone()
+            if not row or not (row[0] or "").startswith("image/"):
+                return None
+
+        image = QImage.fromData(b"".join(self.iter_content(blob_id)))
+        if image.isNull():
+            return None
+
+        image = image.scaled(size, size,
+                             Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+        buffer_data = QByteArray()
+        buffer = QBuffer(buffer_data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        thumbnail = bytes(buffer_data)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO thumbnails (blob_id, size, data)
+                VALUES (?, ?, ?)
+            ''', (blob_id, size, thumbnail))
+            conn.commit()
+
+        return thumbnail
+
+    def remove_attachment(self, attachment_id: int):
+        """Открепление файла от заметки"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM note_attachments WHERE id = ?", (attachment_id,))
+            conn.commit()
+
+        self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """Удаление вложений удаленных заметок и неиспользуемого содержимого"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM note_attachments
+                WHERE note_id NOT IN (SELECT id FROM notes)
+            ''')
+            cursor.execute('''
+                DELETE FROM blobs
+                WHERE id NOT IN (SELECT blob_id FROM note_attachments)
+            ''')
+            removed = cursor.rowcount
+            cursor.execute('''
+                DELETE FROM thumbnails
+                WHERE blob_id NOT IN (SELECT id FROM blobs)
+            ''')
+            conn.commit()
+            return removed
+
+    def get_stats(self) -> Dict:
+        """Получение статистики по вложениям"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT COUNT(*) FROM note_attachments")
+            attachments = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs")
+            blobs, stored_bytes = cursor.fetchone()
+
+            return {
+                "attachments": attachments,
+                "blobs": blobs,
+                "stored_bytes": stored_bytes
+            }
@@ -1,9 +1,11 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLineEdit, 
                              QTextEdit, QPushButton, QHBoxLayout,
-                             QLabel, QMessageBox)
-from PyQt6.QtCore import pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QTextCharFormat, QColor
+                             QLabel, QMessageBox, QListWidget,
+                             QListWidgetItem, QFileDialog)
+from PyQt6.QtCore import pyqtSignal, QTimer, Qt, QSize
+from PyQt6.QtGui import QFont, QTextCharFormat, QColor, QIcon, QPixmap
 from database import Database
+from attachments import AttachmentStore, THUMBNAIL_SIZE
 import re
 
 class NoteEditor(QWidget):
@@ -12,6 +14,7 @@ class NoteEditor(QWidget):
     def __init__(self):
         super().__init__()
         self.db = Database()
+        self.attachments = AttachmentStore(self.db)
         self.current_note_id = 0
         self.is_changed = False
         self.init_ui()
@@ -82,6 +85,28 @@ class NoteEditor(QWidget):
         self.content_edit.textChanged.connect(self.on_content_changed)
         layout.addWidget(self.content_edit)
         
+        # Вложения
+        attachments_layout = QHBoxLayout()
+        
+        self.attachments_list = QListWidget()
+        self.attachments_list.setViewMode(QListWidget.ViewMode.IconMode)
+        self.attachments_list.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.attachments_list.setFixedHeight(THUMBNAIL_SIZE + 40)
+        self.attachments_list.itemDoubleClicked.connect(self.export_attachment)
+        
+        self.attach_btn = QPushButton("📎 Прикрепить")
+        self.attach_btn.clicked.connect(self.add_attachment)
+        
+        self.detach_btn = QPushButton("✖")
+        self.detach_btn.clicked.connect(self.remove_attachment)
+        self.detach_btn.setFixedSize(30, 30)
+        
+        attachments_layout.addWidget(self.attachments_list)
+        attachments_layout.addWidget(self.attach_btn)
+        attachments_layout.addWidget(self.detach_btn)
+        
+        layout.addLayout(attachments_layout)
+        
         # Панель инструментов
         toolbar_layout = QHBoxLayout()
         
@@ -132,6 +157,8 @@ class NoteEditor(QWidget):
             created = note.get('created_at', '')[:19]
             updated = note.get('updated_at', '')[:19]
             self.info_label.setText(f"Создано: {created} | Изменено: {updated}")
+        
+        self.load_attachments()
     
     def new_note(self):
         """Создание новой заметки"""
@@ -143,6 +170,7 @@ class NoteEditor(QWidget):
         self.status_label.setText("Новая заметка")
         self.status_label.setStyleSheet("color: blue;")
         self.info_label.clear()
+        self.attachments_list.clear()
         self.title_input.setFocus()
     
     def save_note(self):
@@ -191,6 +219,57 @@ class NoteEditor(QWidget):
         
         self.new_note()
     
+    def load_attachments(self):
+        """Загрузка списка вложений"""
+        self.attachments_list.clear()
+        if not self.current_note_id:
+            return
+        
+        for attachment in self.attachments.get_attachments(self.current_note_id):
+            item = QListWidgetItem(attachment['filename'])
+            item.setData(Qt.ItemDataRole.UserRole, attachment['id'])
+            item.setToolTip(f"{attachment['filename']} ({attachment['size']} байт)")
+            
+            thumbnail = self.attachments.get_thumbnail(attachment['blob_id'])
+            if thumbnail:
+                pixmap = QPixmap()
+                pixmap.loadFromData(thumbnail)
+                item.setIcon(QIcon(pixmap))
+            
+            self.attachments_list.addItem(item)
+    
+    def add_attachment(self):
+        """Прикрепление файла к заметке"""
+        if not self.current_note_id:
+            QMessageBox.warning(self, "Внимание", "Сначала сохраните заметку")
+            return
+        
+        file_name, _ = QFileDialog.getOpenFileName(self, "Прикрепить файл")
+        if file_name:
+            try:
+                self.attachments.add_file(self.current_note_id, file_name)
+                self.load_attachments()
+            except Exception as e:
+                QMessageBox.critical(self, "Ошибка", f"Не удалось прикрепить: {str(e)}")
+    
+    def remove_attachment(self):
+        """Открепление выбранного файла"""
+        item = self.attachments_list.currentItem()
+        if item:
+            self.attachments.remove_attachment(item.data(Qt.ItemDataRole.UserRole))
+            self.load_attachments()
+    
+    def export_attachment(self, item):
+        """Сохранение вложения в файл"""
+        attachment_id = item.data(Qt.ItemDataRole.UserRole)
+        file_name, _ = QFileDialog.getSaveFileName(self, "Сохранить вложение", item.text())
+        
+        if file_name:
+            try:
+                self.attachments.export(attachment_id, file_name)
+            except Exception as e:
+                QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить: {str(e)}")
+    
     def get_content(self):
         """Получение содержимого заметки"""
         return self.content_edit.toPlainText()
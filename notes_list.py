@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListWidget,
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QAction, QIcon
 from database import Database
+from attachments import AttachmentStore
 
 class NotesList(QWidget):
     note_selected = pyqtSignal(int, str, str)  # id, title, content
@@ -11,6 +12,7 @@ class NotesList(QWidget):
     def __init__(self):
         super().__init__()
         self.db = Database()
+        self.attachments = AttachmentStore(self.db)
         self.current_search = ""
         self.init_ui()
     
@@ -115,6 +117,7 @@ class NotesList(QWidget):
     def delete_note(self, note_id: int):
         """Удаление заметки"""
         self.db.delete_note(note_id)
+        self.attachments.collect_garbage()
         self.load_notes(self.current_search)
     
     def toggle_favorite(self):